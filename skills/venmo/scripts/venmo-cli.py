@@ -1,23 +1,116 @@
 #!/usr/bin/env python3
 """Venmo CLI — self-contained script using only stdlib.
 
+orjson is used for JSON encoding/decoding, ijson for streaming list
+responses, and brotli for compressed responses when they are installed.
+
 Commands:
-    pending   List pending payment requests (charges TO me)
-    request   Create a payment request (charge someone)
-    search    Search for Venmo users by name/username
-    me        Get my profile info
-    friends   List my Venmo friends
+    pending      List pending payment requests (charges TO me)
+    request      Create a payment request (charge someone)
+    search       Search for Venmo users by name/username
+    search-many  Run several user searches concurrently
+    me           Get my profile info
+    friends      List my Venmo friends
 """
 
+# Modules only one command needs (concurrent.futures, decimal, hashlib,
+# tempfile, base64) are imported where they are used to keep startup fast.
 import argparse
+import atexit
+import functools
+import gzip
+import http.client
+import io
 import json
 import os
+import socket
+import ssl
 import sys
+import threading
+import types
 import urllib.request
-import urllib.error
 import urllib.parse
+import zlib
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Failures while sending a request or reading/decompressing its response.
+# A truncated or corrupt compressed body raises EOFError, zlib.error or
+# brotli.error rather than an OSError.
+_TRANSPORT_ERRORS = (OSError, http.client.HTTPException, EOFError, zlib.error)
+if brotli is not None:
+    _TRANSPORT_ERRORS += (brotli.error,)
+
+API_HOST = "api.venmo.com"
+BASE_PATH = "/v1"
+
+# Read-only stand-in for missing or null nested objects, so lookups through
+# them don't allocate a new {} per miss.
+_EMPTY = types.MappingProxyType({})
+
+# Per-thread keep-alive connection, opened on first request (see _connection).
+_local = threading.local()
+
+# Upper bound on concurrent requests for search-many.
+MAX_PARALLEL = 8
+
+# Upper bound for request --amount, well above any Venmo limit; keeps huge
+# values like 1e400 from overflowing the float sent in the payload.
+MAX_AMOUNT = 1_000_000
+
+# SSLContext shared by every connection in the process (see _ssl_context).
+_ssl_ctx = None
+_ssl_ctx_lock = threading.Lock()
+
+# getaddrinfo results by (host, port) (see _resolve).
+_addrinfo = {}
+_addrinfo_lock = threading.Lock()
 
-BASE_URL = "https://api.venmo.com/v1"
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+else:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
+
+def _emit(obj):
+    """Write obj to stdout as indented JSON.
+
+    The bytes go straight to fd 1 with os.write, skipping sys.stdout's text
+    encoding and buffering.
+    """
+    if orjson is not None:
+        payload = orjson.dumps(obj, option=orjson.OPT_INDENT_2) + b"\n"
+    else:
+        payload = (json.dumps(obj, indent=2) + "\n").encode()
+    sys.stdout.flush()
+    view = memoryview(payload)
+    while view:
+        view = view[os.write(1, view):]
+
+
+class ApiError(Exception):
+    """A failed API call. main() prints .payload as the command's JSON error."""
+
+    def __init__(self, payload):
+        super().__init__(payload.get("error"))
+        self.payload = payload
 
 
 def get_token():
@@ -28,50 +121,221 @@ def get_token():
     return token
 
 
-def api_request(method, path, token, data=None, params=None):
-    """Make an authenticated request to the Venmo API."""
-    url = BASE_URL + path
-    if params:
-        url += "?" + urllib.parse.urlencode(params)
+def _ssl_context():
+    """Return the process-wide SSLContext, loading the CA store only once.
+
+    The lock keeps concurrent search-many workers from each building one.
+    """
+    global _ssl_ctx
+    with _ssl_ctx_lock:
+        if _ssl_ctx is None:
+            _ssl_ctx = ssl.create_default_context()
+        return _ssl_ctx
+
+
+def _resolve(host, port):
+    """Resolve host once per process; later connections reuse the addresses.
+
+    The lock also makes concurrent search-many workers share one lookup.
+    """
+    with _addrinfo_lock:
+        addrinfo = _addrinfo.get((host, port))
+        if addrinfo is None:
+            addrinfo = _addrinfo[(host, port)] = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        return addrinfo
 
-    headers = {
-        "Authorization": "Bearer " + token,
+
+def _create_connection(address, timeout, source_address=None):
+    """Like socket.create_connection, but using the cached _resolve() lookup."""
+    err = None
+    for _, _, _, _, sockaddr in _resolve(*address):
+        try:
+            return socket.create_connection(sockaddr[:2], timeout, source_address)
+        except OSError as e:
+            err = e
+    raise err
+
+
+class _HTTPSConnection(http.client.HTTPSConnection):
+    """HTTPSConnection that shares one SSLContext across the process.
+
+    Building a default context reloads the CA bundle every time, so
+    search-many workers and reconnects reuse the one from _ssl_context().
+    """
+
+    def __init__(self, host, port=None):
+        super().__init__(host, port, context=_ssl_context())
+        self._create_connection = _create_connection
+
+
+def _connection():
+    """Return this thread's HTTPS connection to the Venmo API, creating it on first use.
+
+    The connection is kept open between calls so commands that make several
+    requests only pay for the TCP and TLS handshake once. Each thread gets its
+    own connection since http.client connections are not thread-safe. An HTTPS
+    proxy from the environment is honored via a CONNECT tunnel.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        proxy = urllib.request.getproxies().get("https")
+        if proxy and not urllib.request.proxy_bypass(API_HOST):
+            proxy_url = urllib.parse.urlsplit(proxy if "://" in proxy else "http://" + proxy)
+            conn = _HTTPSConnection(proxy_url.hostname, proxy_url.port or 8080)
+            tunnel_headers = {}
+            if proxy_url.username:
+                import base64
+                creds = f"{urllib.parse.unquote(proxy_url.username)}:{urllib.parse.unquote(proxy_url.password or '')}"
+                tunnel_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(creds.encode()).decode()
+            conn.set_tunnel(API_HOST, 443, headers=tunnel_headers)
+        else:
+            conn = _HTTPSConnection(API_HOST)
+        atexit.register(conn.close)
+        _local.conn = conn
+    return conn
+
+
+@functools.lru_cache(maxsize=None)
+def _auth_headers(token):
+    """Return the request headers for token, built once per process."""
+    return {
+        "Authorization": f"Bearer {token}",
         "Content-Type": "application/json",
         "User-Agent": "venmo-cli/1.0",
+        "Accept-Encoding": "gzip, br" if brotli is not None else "gzip",
     }
 
-    body = json.dumps(data).encode() if data else None
-    req = urllib.request.Request(url, data=body, headers=headers, method=method)
+
+def _body(resp):
+    """Return a file-like object over resp's body with any Content-Encoding undone.
+
+    gzip is decompressed incrementally so streamed parsing still works. An
+    encoding we can't decode is a transport error, not a body to parse.
+    """
+    encoding = (resp.getheader("Content-Encoding") or "").strip().lower()
+    if encoding == "gzip":
+        return gzip.GzipFile(fileobj=resp)
+    if encoding == "br" and brotli is not None:
+        return io.BytesIO(brotli.decompress(resp.read()))
+    if encoding not in ("", "identity"):
+        raise http.client.HTTPException(f"Unsupported Content-Encoding: {encoding}")
+    return resp
+
+
+def api_request(method, path, token, data=None, params=None, stream=False):
+    """Make an authenticated request to the Venmo API. Raises ApiError on failure.
+
+    Returns the decoded JSON body, or with stream=True a file-like object
+    over the (decompressed) response for _iter_data() to parse incrementally.
+    """
+    url = f"{BASE_PATH}{path}"
+    if params:
+        if len(params) == 1 and "limit" in params:
+            # Common case: an integer needs no quoting, so skip urlencode
+            url += f"?limit={int(params['limit'])}"
+        else:
+            url += "?" + urllib.parse.urlencode(params)
+
+    headers = _auth_headers(token)
+    body = _dumps(data) if data else None
+    conn = _connection()
+    reused = conn.sock is not None
 
     try:
-        with urllib.request.urlopen(req) as resp:
-            return json.loads(resp.read().decode())
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode()
         try:
-            error_json = json.loads(error_body)
-        except (json.JSONDecodeError, ValueError):
-            error_json = {"raw": error_body}
-        print(json.dumps({"error": f"HTTP {e.code}", "details": error_json}))
-        sys.exit(1)
-    except urllib.error.URLError as e:
-        print(json.dumps({"error": str(e.reason)}))
-        sys.exit(1)
+            conn.request(method, url, body=body, headers=headers)
+            resp = conn.getresponse()
+        except (ConnectionError, ssl.SSLEOFError):
+            # The server may have dropped an idle keep-alive connection. Only GETs
+            # are retried, so a payment request is never sent twice.
+            if not (reused and method == "GET"):
+                raise
+            conn.close()
+            conn.request(method, url, body=body, headers=headers)
+            resp = conn.getresponse()
+        if 200 <= resp.status < 300:
+            if stream:
+                return _body(resp)
+            return _loads(_body(resp).read())
+        raw = _body(resp).read()
+    except _TRANSPORT_ERRORS as e:
+        conn.close()
+        raise ApiError({"error": str(e)}) from e
+
+    error_body = raw.decode(errors="replace")
+    try:
+        error_json = json.loads(error_body)
+    except (json.JSONDecodeError, ValueError):
+        error_json = {"raw": error_body}
+    raise ApiError({"error": f"HTTP {resp.status}", "details": error_json})
+
+
+def _iter_data(resp):
+    """Yield the items of a streamed response's "data" array one at a time.
+
+    Uses ijson when installed so the full response is never held in memory.
+    The response is drained afterwards so the connection can be reused.
+    """
+    try:
+        if ijson is not None:
+            yield from ijson.items(resp, "data.item", use_float=True)
+        else:
+            yield from _loads(resp.read()).get("data", [])
+        resp.read()
+    except _TRANSPORT_ERRORS as e:
+        _connection().close()
+        raise ApiError({"error": str(e)}) from e
+
+
+def _cache_path():
+    """Return the path of the cached user-id file, honoring XDG_CACHE_HOME."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "venmo-cli", "me.json")
+
+
+def _token_key(token):
+    """Return a short, non-reversible cache key for an access token."""
+    import hashlib
+    return hashlib.blake2b(token.encode(), digest_size=8).hexdigest()
+
+
+def _load_id_cache():
+    """Load the {token_key: user_id} cache, returning {} if missing or unreadable."""
+    try:
+        with open(_cache_path(), "rb") as f:
+            cache = _loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_id_cache(cache):
+    """Atomically write the user-id cache. Failures are ignored; the cache is best-effort."""
+    import tempfile
+    path = _cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".me-", suffix=".json")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_dumps(cache))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
 
 
 def cmd_pending(args, token):
     """List pending payment requests (charges TO me)."""
-    resp = api_request("GET", "/payments", token, params={
-        "status": "pending",
-        "action": "charge",
-        "limit": str(args.limit),
-    })
-    payments = resp.get("data", [])
+    # Constant ASCII params plus an int, so the query string needs no encoding
+    resp = api_request("GET", f"/payments?status=pending&action=charge&limit={int(args.limit)}", token,
+                       stream=True)
     results = []
-    for p in payments:
-        actor = p.get("actor", {})
-        target = p.get("target", {})
-        target_user = target.get("user", {})
+    for p in _iter_data(resp):
+        actor = p.get("actor") or _EMPTY
+        target_user = (p.get("target") or _EMPTY).get("user") or _EMPTY
         results.append({
             "id": p.get("id"),
             "amount": p.get("amount"),
@@ -86,40 +350,54 @@ def cmd_pending(args, token):
                 "username": target_user.get("username"),
             },
         })
-    print(json.dumps({"pending_requests": results, "count": len(results)}, indent=2))
+    _emit({"pending_requests": results, "count": len(results)})
 
 
 def cmd_request(args, token):
     """Create a payment request (charge someone)."""
-    amount = float(args.amount)
-    if amount <= 0:
+    import decimal
+    # Parse as Decimal and work in whole cents so no float rounding creeps in
+    try:
+        amount = decimal.Decimal(args.amount)
+    except decimal.InvalidOperation:
+        print(json.dumps({"error": f"Invalid amount: {args.amount!r}"}))
+        sys.exit(1)
+    if not amount.is_finite() or amount <= 0:
+        print(json.dumps({"error": "Amount must be positive. The script negates it to create a request."}))
+        sys.exit(1)
+    if amount > MAX_AMOUNT:
+        print(json.dumps({"error": f"Amount must not exceed {MAX_AMOUNT}."}))
+        sys.exit(1)
+    # Compare against the exact value: arithmetic in the default 28-digit
+    # context could round tiny or over-precise amounts to a whole cent.
+    whole_cents = amount.quantize(decimal.Decimal("0.01"))
+    if amount != whole_cents:
+        print(json.dumps({"error": "Amount cannot include fractions of a cent."}))
+        sys.exit(1)
+    cents = int(whole_cents * 100)
+    if cents <= 0:
         print(json.dumps({"error": "Amount must be positive. The script negates it to create a request."}))
         sys.exit(1)
 
     resp = api_request("POST", "/payments", token, data={
         "user_id": args.user_id,
-        "amount": -amount,  # negative = request money FROM user
+        "amount": -cents / 100,  # negative = request money FROM user
         "note": args.note,
         "audience": args.audience,
     })
-    payment = resp.get("data", {})
-    print(json.dumps({
+    payment = resp.get("data") or _EMPTY
+    _emit({
         "success": True,
         "payment_id": payment.get("id"),
         "amount": payment.get("amount"),
         "note": payment.get("note"),
-        "target": payment.get("target", {}).get("user", {}).get("display_name"),
+        "target": ((payment.get("target") or _EMPTY).get("user") or _EMPTY).get("display_name"),
         "status": payment.get("status"),
-    }, indent=2))
+    })
 
 
-def cmd_search(args, token):
-    """Search for Venmo users by name or username."""
-    resp = api_request("GET", "/users", token, params={
-        "query": args.query,
-        "limit": str(args.limit),
-    })
-    users = resp.get("data", [])
+def _project_users(users):
+    """Project an iterable of user records down to the fields we output."""
     results = []
     for u in users:
         results.append({
@@ -128,15 +406,55 @@ def cmd_search(args, token):
             "display_name": u.get("display_name"),
             "profile_picture_url": u.get("profile_picture_url"),
         })
-    print(json.dumps({"users": results, "count": len(results)}, indent=2))
+    return results
+
+
+def _search_users(query, limit, token):
+    """Return the users matching query, projected to the fields we output."""
+    resp = api_request("GET", "/users", token, params={
+        "query": query,
+        "limit": str(limit),
+    }, stream=True)
+    return _project_users(_iter_data(resp))
+
+
+def cmd_search(args, token):
+    """Search for Venmo users by name or username."""
+    results = _search_users(args.query, args.limit, token)
+    _emit({"users": results, "count": len(results)})
+
+
+def cmd_search_many(args, token):
+    """Run several user searches concurrently."""
+    import concurrent.futures
+    queries = [q.strip() for q in args.queries.split(",") if q.strip()]
+    if not queries:
+        print(json.dumps({"error": "At least one query is required"}))
+        sys.exit(1)
+
+    workers = min(len(queries), MAX_PARALLEL)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_search_users, q, args.limit, token) for q in queries]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+        except ApiError:
+            # Report only the first failure; don't start searches still queued
+            pool.shutdown(cancel_futures=True)
+            raise
+        found = [future.result() for future in futures]
+    _emit({
+        "searches": [{"query": q, "users": users, "count": len(users)} for q, users in zip(queries, found)],
+        "count": len(queries),
+    })
 
 
 def cmd_me(args, token):
     """Get my profile info."""
     resp = api_request("GET", "/me", token)
-    data = resp.get("data", {})
-    user = data.get("user", {})
-    print(json.dumps({
+    data = resp.get("data") or _EMPTY
+    user = data.get("user") or _EMPTY
+    _emit({
         "id": user.get("id"),
         "username": user.get("username"),
         "display_name": user.get("display_name"),
@@ -144,72 +462,93 @@ def cmd_me(args, token):
         "phone": user.get("phone"),
         "profile_picture_url": user.get("profile_picture_url"),
         "balance": data.get("balance"),
-    }, indent=2))
+    })
 
 
 def cmd_friends(args, token):
     """List my Venmo friends."""
-    # First get my user ID
-    me_resp = api_request("GET", "/me", token)
-    my_id = me_resp.get("data", {}).get("user", {}).get("id")
+    # My user ID never changes for a given token, so only ask /me on a cache miss
+    id_cache = _load_id_cache()
+    key = _token_key(token)
+    my_id = id_cache.get(key)
     if not my_id:
-        print(json.dumps({"error": "Could not determine user ID"}))
-        sys.exit(1)
+        me_resp = api_request("GET", "/me", token)
+        my_id = ((me_resp.get("data") or _EMPTY).get("user") or _EMPTY).get("id")
+        if not my_id:
+            print(json.dumps({"error": "Could not determine user ID"}))
+            sys.exit(1)
+        id_cache[key] = my_id
+        _save_id_cache(id_cache)
 
     resp = api_request("GET", f"/users/{my_id}/friends", token, params={
         "limit": str(args.limit),
-    })
-    friends = resp.get("data", [])
-    results = []
-    for f in friends:
-        results.append({
-            "id": f.get("id"),
-            "username": f.get("username"),
-            "display_name": f.get("display_name"),
-            "profile_picture_url": f.get("profile_picture_url"),
-        })
-    print(json.dumps({"friends": results, "count": len(results)}, indent=2))
+    }, stream=True)
+    results = _project_users(_iter_data(resp))
+    _emit({"friends": results, "count": len(results)})
+
+
+COMMANDS = {
+    "pending": cmd_pending,
+    "request": cmd_request,
+    "search": cmd_search,
+    "search-many": cmd_search_many,
+    "me": cmd_me,
+    "friends": cmd_friends,
+}
 
 
 def main():
     parser = argparse.ArgumentParser(description="Venmo CLI")
     sub = parser.add_subparsers(dest="command", required=True)
 
+    # Only build the subparser being invoked; build them all for top-level help and usage errors
+    selected = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] in COMMANDS else None
+
+    def wants(name):
+        return selected is None or selected == name
+
     # pending
-    p_pending = sub.add_parser("pending", help="List pending payment requests")
-    p_pending.add_argument("--limit", type=int, default=25, help="Max results")
+    if wants("pending"):
+        p_pending = sub.add_parser("pending", help="List pending payment requests")
+        p_pending.add_argument("--limit", type=int, default=25, help="Max results")
 
     # request
-    p_request = sub.add_parser("request", help="Create a payment request")
-    p_request.add_argument("--user-id", required=True, help="Target user ID")
-    p_request.add_argument("--amount", required=True, help="Amount to request (positive number)")
-    p_request.add_argument("--note", required=True, help="Payment note/description")
-    p_request.add_argument("--audience", default="private", choices=["private", "friends", "public"],
-                           help="Visibility (default: private)")
+    if wants("request"):
+        p_request = sub.add_parser("request", help="Create a payment request")
+        p_request.add_argument("--user-id", required=True, help="Target user ID")
+        p_request.add_argument("--amount", required=True, help="Amount to request (positive number)")
+        p_request.add_argument("--note", required=True, help="Payment note/description")
+        p_request.add_argument("--audience", default="private", choices=["private", "friends", "public"],
+                               help="Visibility (default: private)")
 
     # search
-    p_search = sub.add_parser("search", help="Search for Venmo users")
-    p_search.add_argument("--query", required=True, help="Search query (name or username)")
-    p_search.add_argument("--limit", type=int, default=10, help="Max results")
+    if wants("search"):
+        p_search = sub.add_parser("search", help="Search for Venmo users")
+        p_search.add_argument("--query", required=True, help="Search query (name or username)")
+        p_search.add_argument("--limit", type=int, default=10, help="Max results")
+
+    # search-many
+    if wants("search-many"):
+        p_search_many = sub.add_parser("search-many", help="Search for several Venmo users at once")
+        p_search_many.add_argument("--queries", required=True, help="Comma-separated search queries")
+        p_search_many.add_argument("--limit", type=int, default=10, help="Max results per query")
 
     # me
-    sub.add_parser("me", help="Get my profile info")
+    if wants("me"):
+        sub.add_parser("me", help="Get my profile info")
 
     # friends
-    p_friends = sub.add_parser("friends", help="List my Venmo friends")
-    p_friends.add_argument("--limit", type=int, default=50, help="Max results")
+    if wants("friends"):
+        p_friends = sub.add_parser("friends", help="List my Venmo friends")
+        p_friends.add_argument("--limit", type=int, default=50, help="Max results")
 
     args = parser.parse_args()
     token = get_token()
-
-    commands = {
-        "pending": cmd_pending,
-        "request": cmd_request,
-        "search": cmd_search,
-        "me": cmd_me,
-        "friends": cmd_friends,
-    }
-    commands[args.command](args, token)
+    try:
+        COMMANDS[args.command](args, token)
+    except ApiError as e:
+        print(json.dumps(e.payload))
+        sys.exit(1)
 
 
 if __name__ == "__main__":